@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Fetch the latest NDBC buoy observations and send them to APRS-IS as objects."""
+
+import hashlib
+import json
+import logging
+import math
+import socket
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+NDBC_URL = "https://www.ndbc.noaa.gov/data/latest_obs/latest_obs.txt"
+
+APRS_HOST = "rotate.aprs2.net"
+APRS_PORT = 14580
+APRS_CALLSIGN = "N0CALL"
+APRS_PASSCODE = "-1"
+APRS_VERSION = "aprsfirenet-buoy 1.0"
+PACKET_INTERVAL = 1.0  # seconds between packets on APRS-IS
+
+# One pooled session for the life of the process, so repeated fetches (cron
+# loop today, daemon mode later) reuse the TCP/TLS connection instead of
+# paying a fresh handshake for every ~100KB download.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+# NDBC's plaintext compresses ~10:1, so always ask for a compressed body;
+# requests decodes it transparently.
+SESSION.headers.update({
+    "Connection": "keep-alive",
+    "Accept-Encoding": "gzip, deflate",
+})
+
+# On-disk cache so a cron-driven run can revalidate with a conditional GET
+# and skip download/parse/send entirely when NDBC has nothing new.
+CACHE_DIR = Path.home() / ".cache" / "aprsfirenet"
+META_FILE = CACHE_DIR / "buoy.meta"
+BODY_FILE = CACHE_DIR / "buoy.txt"
+
+log = logging.getLogger("buoy")
+
+
+def _load_meta():
+    """Return the cached ETag/Last-Modified/body-hash metadata, if any."""
+    try:
+        return json.loads(META_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_meta(meta):
+    """Persist validator metadata for the next run's conditional GET."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    META_FILE.write_text(json.dumps(meta))
+
+
+# Hoisted lookups for the per-line formatters: indexing a module-level tuple
+# and calling a bound .format skips re-parsing the spec on every call.
+_LAT_DIR = ("S", "N")
+_LON_DIR = ("W", "E")
+_FMT2 = "{:02d}".format
+_FMT3 = "{:03d}".format
+_FMT5 = "{:05d}".format
+
+
+def decimal_to_dmd(value, is_lat=True):
+    """Convert decimal degrees to the APRS ddmm.hh degrees-minutes form."""
+    # Work in integer milli-minutes so there is a single rounding step and
+    # no float formatting; one divmod yields degrees and the minute remainder.
+    milli_minutes = int(round(abs(value) * 60000))
+    degrees, remainder = divmod(milli_minutes, 60000)
+    minutes, hundredths = divmod(remainder // 10, 100)
+    if is_lat:
+        return (_FMT2(degrees) + _FMT2(minutes) + "."
+                + _FMT2(hundredths) + _LAT_DIR[value >= 0])
+    return (_FMT3(degrees) + _FMT2(minutes) + "."
+            + _FMT2(hundredths) + _LON_DIR[value >= 0])
+
+
+def _mph(value):
+    """m/s to whole mph."""
+    return int(value * 2.23694)
+
+
+def _degf(value):
+    """Celsius to whole Fahrenheit."""
+    return int(round(value * 1.8 + 32))
+
+
+def _tenths_mb(value):
+    """hPa to tenths of millibars."""
+    return int(value * 10)
+
+
+def _f(value):
+    """Parse a raw NDBC field to float, mapping the MM sentinel to NaN."""
+    return math.nan if value == b"MM" else float(value)
+
+
+def convert_wind_speed(value):
+    """Convert wind speed in m/s to the three-digit whole-mph APRS field."""
+    return "..." if math.isnan(value) else _FMT3(_mph(value))
+
+
+def convert_temperature(value):
+    """Convert air temperature in Celsius to the three-digit Fahrenheit APRS field."""
+    return "..." if math.isnan(value) else _FMT3(_degf(value))
+
+
+def convert_pressure(value):
+    """Convert pressure in hPa to the five-digit tenths-of-millibars APRS field."""
+    return "....." if math.isnan(value) else _FMT5(_tenths_mb(value))
+
+
+def _parse_line(raw, cutoff):
+    """Parse one raw observation line into a buoy dict, or None if not sendable.
+
+    The line is consumed as undecoded bytes: int() and float() accept ASCII
+    bytes directly, so only the station id is ever decoded to str.
+    """
+    if not raw or raw[:1] == b"#":
+        return None
+    # maxsplit=18 keeps ATMP (field 17) a clean token and leaves the
+    # unused trailing columns unsplit in fields[18].
+    fields = raw.split(None, 18)
+    if len(fields) < 18:
+        return None
+
+    obs_time = datetime(
+        int(fields[3]), int(fields[4]), int(fields[5]),
+        int(fields[6]), int(fields[7])
+    )
+    if obs_time < cutoff:
+        # Lazy %s formatting: nothing is built unless debug logging is on.
+        log.debug("Skipping %s: observation too old", fields[0])
+        return None
+    buoy_id = fields[0].decode()
+
+    wind_dir = _f(fields[8])
+    wind_dir = "..." if math.isnan(wind_dir) else _FMT3(int(wind_dir))
+
+    return {
+        "id": buoy_id,
+        "lat": decimal_to_dmd(float(fields[1]), is_lat=True),
+        "lon": decimal_to_dmd(float(fields[2]), is_lat=False),
+        "time": obs_time.strftime("%d%H%M"),
+        "wind_dir": wind_dir,
+        "wind_speed": convert_wind_speed(_f(fields[9])),
+        "wind_gust": convert_wind_speed(_f(fields[10])),
+        "air_temp": convert_temperature(_f(fields[17])),
+        "pressure": convert_pressure(_f(fields[15])),
+    }
+
+
+def get_latest_buoy_data():
+    """Download latest_obs.txt and return the observations fresh enough to send."""
+    meta = _load_meta()
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    buoys = []
+    cutoff = datetime.utcnow() - timedelta(minutes=30)
+    digest = hashlib.sha256()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with SESSION.get(NDBC_URL, timeout=(3, 10), headers=headers,
+                     stream=True) as response:
+        if response.status_code == 304:
+            log.info("NDBC not modified since last run, nothing to send")
+            return []
+        response.raise_for_status()
+
+        # Parse lines as they arrive instead of materializing response.text
+        # plus a splitlines() copy; the cache body and hash are built from
+        # the same pass.
+        with BODY_FILE.open("wb") as cache:
+            for raw in response.iter_lines():
+                digest.update(raw)
+                cache.write(raw + b"\n")
+                buoy = _parse_line(raw, cutoff)
+                if buoy is not None:
+                    buoys.append(buoy)
+
+    digest = digest.hexdigest()
+    if digest == meta.get("sha256"):
+        log.info("NDBC body unchanged, nothing to send")
+        return []
+    _save_meta({
+        "etag": response.headers.get("ETag", ""),
+        "last_modified": response.headers.get("Last-Modified", ""),
+        "sha256": digest,
+    })
+    return buoys
+
+
+def build_packet(buoy):
+    """Render one buoy observation as an APRS object with a weather block."""
+    return (
+        f"{APRS_CALLSIGN}>APRS,TCPIP*:;{buoy['id']:<9}*{buoy['time']}z"
+        f"{buoy['lat']}/{buoy['lon']}_"
+        f"{buoy['wind_dir']}/{buoy['wind_speed']}g{buoy['wind_gust']}"
+        f"t{buoy['air_temp']}b{buoy['pressure']}"
+    )
+
+
+def send_all(callsign, passcode, packets):
+    """Log in to APRS-IS once and stream every packet over the same socket."""
+    if not packets:
+        return
+    # Encode everything up front so the paced loop below does no string work.
+    frames = [(packet + "\n").encode() for packet in packets]
+    with socket.create_connection((APRS_HOST, APRS_PORT), timeout=10) as s:
+        # The packets are small single frames; don't let Nagle hold them back.
+        s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        s.sendall(f"user {callsign} pass {passcode} vers {APRS_VERSION}\n".encode())
+        log.info("APRS-IS: %s", s.recv(1024).decode(errors="replace").strip())
+        # Pace against a monotonic schedule so the time spent in sendall
+        # counts toward the 1 s budget, instead of sleeping a full second
+        # on top of every send. If sends run behind schedule, every frame
+        # whose slot has already elapsed goes out in a single sendall
+        # (chunk boundaries stay on packet newlines).
+        next_send = time.monotonic()
+        i = 0
+        while i < len(frames):
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            elapsed = time.monotonic() - next_send
+            n = min(1 + int(elapsed // PACKET_INTERVAL), len(frames) - i)
+            s.sendall(b"".join(frames[i:i + n]))
+            i += n
+            next_send += n * PACKET_INTERVAL
+
+
+def main():
+    buoys = get_latest_buoy_data()
+    send_all(APRS_CALLSIGN, APRS_PASSCODE, [build_packet(b) for b in buoys])
+    log.info("Sent %d buoy objects", len(buoys))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()